@@ -4,6 +4,15 @@ import pygame
 from grovepi import *
 from grove_rgb_lcd import *
 import math
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import MappingProxyType
+
+try:
+    import evdev # IR 리모컨 wake (선택)
+except ImportError:
+    evdev = None
 
 # ========================================
 # Constants 
@@ -33,6 +42,51 @@ PIR_MOTION_THRESHOLD = 2
 PAUSE_ON_NO_MOTION_S = 8
 PAUSE_ON_MOTION_S = 8
 
+# --- NEW: Multi-PIR Sensor Fusion ---
+# (GrovePi 포트, 구역 이름(1글자), 가중치)
+PIR_SENSORS = [
+    (PIR_D, "A", 1.0),
+    # (2, "B", 1.0),
+    # (16, "C", 0.5),  # A2 포트를 디지털 D16으로 사용
+]
+PIR_FUSION_POLICIES = ("any", "majority", "weighted")
+PIR_FUSION = "any"            # PIR_FUSION_POLICIES 중 하나
+PIR_WEIGHTED_THRESHOLD = 0.5  # weighted: 감지된 가중치 합 / 전체 가중치 >= 이 값이면 motion
+# --- END NEW ---
+
+# --- NEW: Live Status Dashboard (SSE) ---
+DASHBOARD_ENABLED = False     # True 로 켜면 LAN 에 인증 없는 :8080 서버가 열림
+DASHBOARD_PORT = 8080
+DASHBOARD_MAX_CLIENTS = 8
+DASHBOARD_MIN_INTERVAL_S = 0.5  # 클라이언트당 최대 전송 주기 (throttle)
+DASHBOARD_KEEPALIVE_S = 15
+# --- END NEW ---
+
+# --- NEW: Runtime Profiler ---
+PROFILE_ENABLED = True
+PROFILE_BUCKETS = 25                 # log2 버킷: 1us 미만 ~ 8.4s, 마지막 칸은 2^23us(8.4s) 이상
+PROFILE_DUMP_PATH = "profile.txt"
+TICK_PERIOD_S = 1.0                  # 의도한 틱 주기 (구조적 초과분은 overrun_s 에 누적)
+TICK_LATE_TOLERANCE_S = 0.25         # 틱 예산(주기 + 예상 작업 시간)을 이만큼 넘으면 늦은 틱
+TICK_BUCKET_MIN_S = 0.9              # tick 은 선형 버킷: 0.9 ~ 2.5s, 50ms 간격
+TICK_BUCKET_STEP_S = 0.05
+TICK_BUCKETS = 34                    # <0.9s 1칸 + 32칸 + >=2.5s 1칸
+DIAG_CHORD_WINDOW_S = 0.08           # 모드 화면에서 B1/B3 한쪽이 눌린 뒤 나머지를 기다리는 시간
+# --- END NEW ---
+
+# --- NEW: Idle Power Mode ---
+IDLE_DIM_S = 30               # 메뉴에서 입력 없이 이 시간이 지나면 백라이트 dim
+IDLE_OFF_S = 120              # 이 시간이 지나면 백라이트 off
+IDLE_DIM_RATIO = 0.15         # dim 밝기 (현재 색상 대비)
+IDLE_MENU_PIR_POLL_S = 2.0    # 메뉴 화면 PIR 샘플링 주기 (dim 방지용이라 느려도 됨)
+IDLE_PIR_POLL_S = 0.5         # dim 단계 PIR 샘플링 주기 (wake 반응성)
+IDLE_OFF_PIR_POLL_S = 2.0     # 백라이트 off 단계 PIR 샘플링 주기 (back-off)
+IDLE_PIR_CONFIRM_SAMPLES = 2  # 연속 이만큼 감지되어야 활동/wake 로 인정
+IDLE_BUTTON_POLL_S = 0.05     # 엣지 감지를 못 쓸 때만 사용하는 버튼 폴링 주기
+IDLE_WAKE_BUDGET_MS = 100     # wake → 첫 프레임 목표 지연
+IR_DEVICE_PATH = '/dev/input/event5'
+# --- END NEW ---
+
 pygame.mixer.init()
 sound_sample=pygame.mixer.music
 sound_sample.load("/home/pi/iot/music.mp3")
@@ -48,6 +102,256 @@ menu = [
     [3]  # 세트수 (m[3][0])
 ]
 
+# ========================================
+# Runtime Profiler
+# ========================================
+# 호출 종류별 고정 크기 히스토그램: name -> [count, total_s, max_s, buckets]
+# 기본은 log2 버킷: b 는 [2^(b-1), 2^b) us 구간 (b=0 은 1us 미만)
+# "tick" 만 선형 버킷: b 는 [MIN + (b-1)*STEP, MIN + b*STEP) 구간 (b=0 은 MIN 미만)
+_profile = {}
+_tick_stats = {"ticks": 0, "late": 0, "missed": 0, "overrun_s": 0.0}
+
+def _bucket_index(name, elapsed_s):
+    if name == "tick":
+        b = math.floor((elapsed_s - TICK_BUCKET_MIN_S) / TICK_BUCKET_STEP_S + 1e-9) + 1
+        return max(0, min(b, TICK_BUCKETS - 1))
+    return min(int(elapsed_s * 1e6).bit_length(), PROFILE_BUCKETS - 1)
+
+def _bucket_upper_ms(name, b):
+    if name == "tick":
+        return (TICK_BUCKET_MIN_S + b * TICK_BUCKET_STEP_S) * 1000.0
+    return (1 << b) / 1000.0
+
+def record_latency(name, elapsed_s):
+    h = _profile.get(name)
+    if h is None:
+        size = TICK_BUCKETS if name == "tick" else PROFILE_BUCKETS
+        h = _profile[name] = [0, 0.0, 0.0, [0] * size]
+    h[0] += 1
+    h[1] += elapsed_s
+    if elapsed_s > h[2]:
+        h[2] = elapsed_s
+    h[3][_bucket_index(name, elapsed_s)] += 1
+
+def profiled(name, func):
+    """func 호출 시간을 name 히스토그램에 기록하는 래퍼"""
+    if not PROFILE_ENABLED:
+        return func
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record_latency(name, time.perf_counter() - start)
+    return wrapper
+
+def record_tick(elapsed_s, work_s=0.0):
+    """1초 틱 소요 시간 기록
+
+    - overrun_s: 1초 주기를 넘긴 시간 누적 (PIR 스캔 등 구조적 초과 포함)
+    - late: 틱 예산(주기 + 예상 작업 work_s + 허용치)을 넘긴 틱 수 → 평소보다 느린 틱만
+    - missed: 주기를 통째로 넘긴 횟수 (초과분 / 주기 의 정수 부분)
+    """
+    if not PROFILE_ENABLED:
+        return
+    record_latency("tick", elapsed_s)
+    _tick_stats["ticks"] += 1
+    overrun_s = elapsed_s - TICK_PERIOD_S
+    if overrun_s > 0:
+        _tick_stats["overrun_s"] += overrun_s
+        _tick_stats["missed"] += int(overrun_s / TICK_PERIOD_S)
+    if overrun_s > work_s + TICK_LATE_TOLERANCE_S:
+        _tick_stats["late"] += 1
+
+def percentile_ms(name, q):
+    """히스토그램 버킷 상한으로 근사한 백분위수 (ms)"""
+    count, _, max_s, buckets = _profile[name]
+    target = q * count
+    seen = 0
+    for b, n in enumerate(buckets):
+        seen += n
+        if seen >= target:
+            # 마지막(overflow) 버킷은 상한이 없으므로 max 로 대신함
+            return max_s * 1000.0 if b == len(buckets) - 1 else _bucket_upper_ms(name, b)
+    return max_s * 1000.0
+
+def dump_profile(path=PROFILE_DUMP_PATH):
+    if not PROFILE_ENABLED:
+        return
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"ticks={_tick_stats['ticks']} late={_tick_stats['late']} missed={_tick_stats['missed']} "
+                    f"overrun={_tick_stats['overrun_s']:.1f}s\n")
+            for name in sorted(_profile):
+                count, total, max_s, buckets = _profile[name]
+                f.write(f"{name}: n={count} mean={total / count * 1000:.2f}ms "
+                        f"p50<{percentile_ms(name, 0.5):g}ms p99<{percentile_ms(name, 0.99):g}ms "
+                        f"max={max_s * 1000:.2f}ms\n")
+                if name == "tick":
+                    f.write(f"  buckets(<{TICK_BUCKET_MIN_S}s+{TICK_BUCKET_STEP_S}s*b)={buckets}\n")
+                else:
+                    f.write(f"  buckets(us<2^b)={buckets}\n")
+        print(f"프로파일 저장 완료 → {path}")
+    except Exception as e:
+        print(f"프로파일 저장 실패: {e}")
+
+# 하드웨어 호출 계측 (beep_ms 는 정의 직후에 감쌈)
+setText = profiled("setText", setText)
+setRGB = profiled("setRGB", setRGB)
+dht = profiled("dht", dht)
+digitalRead = profiled("digitalRead", digitalRead)
+digitalWrite = profiled("digitalWrite", digitalWrite)
+GPIO.input = profiled("GPIO.input", GPIO.input)
+
+# ========================================
+# Idle Power Manager
+# ========================================
+# 버튼(GPIO 엣지)/IR 이벤트는 콜백 스레드가 _wake_event 를 세워 즉시 깨우고,
+# PIR 은 GrovePi 라 메뉴/dim/off 단계별 주기로만 한 번씩 읽는다.
+_wake_event = threading.Event()
+_wake_at = 0.0             # wake 이벤트 발생 시각 (perf_counter)
+_edge_wake = False         # GPIO 엣지 감지 사용 가능 여부
+_last_activity = time.time()
+_lcd_rgb = (255, 255, 255) # 현재 백라이트 색 (wake 시 복구용)
+_pir_hits = 0              # 연속 PIR 감지 횟수
+_pir_first_hit_at = 0.0    # 연속 감지의 첫 샘플 시각 (perf_counter)
+_last_pir_poll = 0.0
+
+_setRGB_raw = setRGB
+def setRGB(r, g, b):
+    global _lcd_rgb
+    _lcd_rgb = (r, g, b)
+    _setRGB_raw(r, g, b)
+
+def signal_wake(*args):
+    global _wake_at
+    _wake_at = time.perf_counter()
+    _wake_event.set()
+
+def note_activity():
+    global _last_activity
+    _last_activity = time.time()
+
+def _ir_wake_loop():
+    try:
+        device = evdev.InputDevice(IR_DEVICE_PATH)
+        for event in device.read_loop():
+            if event.type == evdev.ecodes.EV_MSC:
+                signal_wake()
+    except OSError as e:
+        print(f"IR wake disabled: {e}")
+
+def init_wake_sources():
+    """버튼 엣지 콜백 + IR 리스너 등록 (init_hardware 이후 호출)"""
+    global _edge_wake
+    try:
+        for pin in btn:
+            GPIO.add_event_detect(pin, GPIO.RISING, callback=signal_wake)
+        _edge_wake = True
+    except RuntimeError as e:
+        print(f"Edge detect unavailable, polling buttons in idle: {e}")
+
+    if evdev is not None:
+        threading.Thread(target=_ir_wake_loop, daemon=True).start()
+
+def any_pir_motion():
+    """idle 용 1샘플 PIR 읽기"""
+    for port, _, _ in PIR_SENSORS:
+        try:
+            if digitalRead(port):
+                return True
+        except Exception:
+            pass
+    return False
+
+def pir_activity_sample():
+    """1샘플 읽고, IDLE_PIR_CONFIRM_SAMPLES 번 연속 감지면 True"""
+    global _pir_hits, _pir_first_hit_at
+    if any_pir_motion():
+        if _pir_hits == 0:
+            _pir_first_hit_at = time.perf_counter()
+        _pir_hits += 1
+    else:
+        _pir_hits = 0
+    return _pir_hits >= IDLE_PIR_CONFIRM_SAMPLES
+
+def poll_menu_pir():
+    """메뉴 화면에서 IDLE_MENU_PIR_POLL_S 마다 PIR 확인 → 사람이 있으면 dim 하지 않음"""
+    global _last_pir_poll
+    now = time.time()
+    if now - _last_pir_poll < IDLE_MENU_PIR_POLL_S:
+        return
+    _last_pir_poll = now
+    if pir_activity_sample():
+        note_activity()
+
+def run_idle():
+    """Dim → Off 단계로 절전하며 wake 이벤트까지 대기, 깨어나면 백라이트 복구
+
+    wake 지연은 사용자가 실제로 입력한 시점부터 잰다:
+    버튼/IR 엣지는 콜백 시각, 폴링 버튼은 해당 폴링 구간 시작 시각,
+    PIR 은 연속 감지의 첫 샘플 시각 (PIR 은 "wake_pir" 로 따로 기록).
+    """
+    global _pir_hits, _wake_at
+    # dim 처리 중 들어온 입력을 잃지 않도록 먼저 이벤트를 비움
+    _wake_event.clear()
+    _pir_hits = 0
+
+    r, g, b = _lcd_rgb
+    _setRGB_raw(int(r * IDLE_DIM_RATIO), int(g * IDLE_DIM_RATIO), int(b * IDLE_DIM_RATIO))
+    all_leds_off()
+    publish_state(phase="IDLE")
+    print("[IDLE] dim")
+
+    backlight_off = False
+    pir_poll_s = IDLE_PIR_POLL_S
+    last_pir = time.time()
+    source = "event"
+    window_start = time.perf_counter()
+
+    # 이미 눌려 있는 버튼은 엣지가 다시 오지 않으므로 한 번 직접 확인
+    if any(GPIO.input(p) == GPIO.HIGH for p in btn):
+        signal_wake()
+        source = "button"
+
+    while not _wake_event.wait(pir_poll_s if _edge_wake else IDLE_BUTTON_POLL_S):
+        now = time.time()
+        if not _edge_wake:
+            if any(GPIO.input(p) == GPIO.HIGH for p in btn):
+                signal_wake()
+                _wake_at = window_start # 폴링 구간 시작부터 눌려 있었을 수 있음
+                source = "button"
+                break
+            window_start = time.perf_counter()
+        if now - last_pir >= pir_poll_s:
+            last_pir = now
+            if pir_activity_sample():
+                signal_wake()
+                _wake_at = _pir_first_hit_at
+                source = "pir"
+                break
+        if not backlight_off and now - _last_activity >= IDLE_OFF_S:
+            _setRGB_raw(0, 0, 0)
+            backlight_off = True
+            pir_poll_s = IDLE_OFF_PIR_POLL_S # 꺼진 뒤에는 PIR 샘플링도 줄임
+            print("[IDLE] backlight off")
+
+    # 첫 프레임: 백라이트 복구 (LCD 텍스트는 그대로 남아 있음)
+    _setRGB_raw(r, g, b)
+    wake_s = time.perf_counter() - _wake_at
+    record_latency("wake_pir" if source == "pir" else "wake", wake_s)
+    if wake_s * 1000 > IDLE_WAKE_BUDGET_MS:
+        print(f"[IDLE] slow wake ({source}): {wake_s * 1000:.1f}ms")
+    publish_state(phase="MENU")
+
+    # wake 에 사용된 버튼 입력은 소비
+    while any(GPIO.input(p) == GPIO.HIGH for p in btn):
+        time.sleep(0.01)
+    time.sleep(BUTTON_DEBOUNCE_S)
+    _wake_event.clear()
+    note_activity()
+
 # ========================================
 # LED Helper Functions
 # ========================================
@@ -72,6 +376,9 @@ def all_leds_off():
 # 하드웨어 초기화 
 # ========================================
 def init_hardware():
+    if PIR_FUSION not in PIR_FUSION_POLICIES:
+        raise ValueError(f"Unknown PIR_FUSION {PIR_FUSION!r} (expected one of {PIR_FUSION_POLICIES})")
+
     GPIO.setwarnings(False)
     GPIO.setmode(GPIO.BCM)
 
@@ -81,7 +388,8 @@ def init_hardware():
     
     # GrovePi PIR, buzzer, LEDs 초기화
     try:
-        pinMode(PIR_D, "INPUT")
+        for port, _, _ in PIR_SENSORS:
+            pinMode(port, "INPUT")
         pinMode(BUZZER_D, "OUTPUT")
         for pin in LED_PINS:
             pinMode(pin, "OUTPUT")
@@ -104,6 +412,7 @@ def beep_ms(ms: int):
         digitalWrite(BUZZER_D, 0)
     except Exception:
         pass # Ignore errors
+beep_ms = profiled("beep_ms", beep_ms)
 
 def short_beep(times=1, dur_ms=120, gap_ms=80):
     for _ in range(times):
@@ -128,6 +437,116 @@ def _noop(*args, **kwargs): pass
 play_bgm = pause_bgm = resume_bgm = stop_bgm = _noop
 # --- End Sound Mapping ---
 
+# ========================================
+# Live Status Dashboard (SSE)
+# ========================================
+# 상태 스냅샷은 (version, 읽기전용 dict) 튜플로 통째로 교체된다.
+# 메인 루프만 publish 하고, 클라이언트 스레드는 참조 하나만 읽으므로
+# 락이 필요 없다 → 접속자 수와 무관하게 run_single_set 틱에 지연 없음.
+_state_snapshot = (0, MappingProxyType({
+    "phase": "MENU",
+    "mode": None,
+    "set": None,
+    "total_sets": None,
+    "remaining_s": None,
+    "motion": None,
+    "zones": None,
+    "reason": None,
+    "temp": None,
+    "hum": None,
+    "ts": time.time(),
+}))
+
+def publish_state(**changes):
+    """새 불변 스냅샷을 만들어 교체 (메인 스레드 전용)"""
+    global _state_snapshot
+    version, state = _state_snapshot
+    new_state = dict(state)
+    new_state.update(changes)
+    new_state["ts"] = time.time()
+    _state_snapshot = (version + 1, MappingProxyType(new_state))
+
+DASHBOARD_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Exercise Timer</title>
+<style>body{font-family:sans-serif;margin:2em}td{padding:4px 12px}</style>
+</head><body><h2>Exercise Timer - Live</h2><table id="s"></table>
+<script>
+const t = document.getElementById("s");
+const es = new EventSource("/events");
+es.onmessage = (e) => {
+  const s = JSON.parse(e.data);
+  t.innerHTML = Object.keys(s).map(k => `<tr><td>${k}</td><td>${s[k] ?? "-"}</td></tr>`).join("");
+};
+</script></body></html>
+"""
+
+_dashboard_slots = threading.BoundedSemaphore(DASHBOARD_MAX_CLIENTS)
+_dashboard_server = None
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/":
+            body = DASHBOARD_HTML.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/events":
+            self.stream_events()
+        else:
+            self.send_error(404)
+
+    def stream_events(self):
+        """스냅샷 버전이 바뀔 때만, 최대 DASHBOARD_MIN_INTERVAL_S 주기로 전송"""
+        if not _dashboard_slots.acquire(blocking=False):
+            self.send_error(503, "Too many clients")
+            return
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+
+            last_version = -1
+            last_sent = 0.0
+            while True:
+                version, state = _state_snapshot
+                now = time.time()
+                if version != last_version:
+                    self.wfile.write(f"data: {json.dumps(dict(state))}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    last_version = version
+                    last_sent = now
+                elif now - last_sent >= DASHBOARD_KEEPALIVE_S:
+                    self.wfile.write(b": ping\n\n")
+                    self.wfile.flush()
+                    last_sent = now
+                time.sleep(DASHBOARD_MIN_INTERVAL_S)
+        except OSError:
+            pass # 클라이언트 연결 종료
+        finally:
+            _dashboard_slots.release()
+
+    def log_message(self, format, *args):
+        pass # 요청마다 print 하지 않음
+
+def start_dashboard():
+    global _dashboard_server
+    if not DASHBOARD_ENABLED:
+        return
+    try:
+        _dashboard_server = ThreadingHTTPServer(("", DASHBOARD_PORT), DashboardHandler)
+        _dashboard_server.daemon_threads = True
+        threading.Thread(target=_dashboard_server.serve_forever, daemon=True).start()
+        print(f"Dashboard: http://<pi-ip>:{DASHBOARD_PORT}/")
+    except OSError as e:
+        print(f"Dashboard start error: {e}")
+
+def stop_dashboard():
+    if _dashboard_server is not None:
+        _dashboard_server.shutdown()
+
 # ========================================
 # LCD Menu Functions 
 # ========================================
@@ -191,19 +610,41 @@ def responsive_sleep(duration_s):
         time.sleep(1 / steps)
     return False
 
-def read_pir_stable():
-    """Stable PIR Read"""
-    samples = []
+def read_pir_zones():
+    """모든 PIR을 한 번의 스캔으로 샘플링 → 구역별 0/1 리스트
+
+    샘플 라운드마다 전체 포트를 연달아 읽고 대기는 한 번만 하므로
+    센서를 늘려도 스캔 시간은 PIR_SAMPLES * PIR_INTERVAL_S 그대로다.
+    (GrovePi I2C 버스는 스레드 안전하지 않아 스레드 대신 한 스캔으로 묶음)
+    """
+    counts = [0] * len(PIR_SENSORS)
     for _ in range(PIR_SAMPLES):
-        try:
-            val = digitalRead(PIR_D)
-            samples.append(val)
-        except Exception:
-            samples.append(0)
+        for i, (port, _, _) in enumerate(PIR_SENSORS):
+            try:
+                counts[i] += digitalRead(port)
+            except Exception:
+                pass # 읽기 실패는 0으로 간주
         time.sleep(PIR_INTERVAL_S)
-    
-    motion_count = sum(samples)
-    return 1 if motion_count >= PIR_MOTION_THRESHOLD else 0
+
+    return [1 if c >= PIR_MOTION_THRESHOLD else 0 for c in counts]
+
+def fuse_motion(zones):
+    """구역별 감지 결과를 PIR_FUSION 정책으로 합침"""
+    if PIR_FUSION == "majority":
+        return 1 if sum(zones) * 2 > len(zones) else 0
+    if PIR_FUSION == "weighted":
+        total = sum(w for _, _, w in PIR_SENSORS)
+        active = sum(w for z, (_, _, w) in zip(zones, PIR_SENSORS) if z)
+        return 1 if total > 0 and active / total >= PIR_WEIGHTED_THRESHOLD else 0
+    return 1 if any(zones) else 0 # "any"
+
+def format_zones(zones):
+    """LCD용 구역 표시: 감지된 구역은 이름, 아니면 '.'"""
+    return "".join(name if z else "." for z, (_, name, _) in zip(zones, PIR_SENSORS))
+
+def read_pir_stable():
+    """Stable PIR Read (fused)"""
+    return fuse_motion(read_pir_zones())
 
 def wait_for_resume(required_state):
     """Wait for resume from pause."""
@@ -221,7 +662,8 @@ def wait_for_resume(required_state):
 def init_pir_for_exercise():
     """PIR 초기화"""
     try:
-        pinMode(PIR_D, "INPUT")
+        for port, _, _ in PIR_SENSORS:
+            pinMode(port, "INPUT")
         time.sleep(0.5)
     except Exception as e:
         print(f"PIR init error: {e}")
@@ -250,6 +692,7 @@ def handle_pause(reason, required_state):
 
     setRGB(255, 165, 0)
     setText(f"PAUSED\n{reason}")
+    publish_state(phase="PAUSED", reason=reason)
 
     if wait_for_resume(required_state):
         stop_bgm()
@@ -260,27 +703,36 @@ def handle_pause(reason, required_state):
 
     ok_sound()
     resume_bgm()
+    publish_state(phase="EXERCISE", reason=None)
     return True
 
 
-def update_exercise_display(mode, set_num, total_sets, motion, timer_s, exercise_s):
+def update_exercise_display(mode, set_num, total_sets, motion, timer_s, exercise_s, zones=None):
     """LCD 운동 진행 상황 갱신"""
     status_text = "MOVE" if motion == 1 else "STAY"
     remaining_s = exercise_s - timer_s
     bar = get_progress_bar(timer_s, exercise_s, 10)
 
+    if zones is not None and len(zones) > 1:
+        # 센서가 여러 개면 상태 대신 구역별 감지 표시 (예: "A.C")
+        line1 = f"M{mode} S{set_num}/{total_sets} {format_zones(zones)}"
+    else:
+        line1 = f"M{mode} Set {set_num}/{total_sets} {status_text}"
+
     setRGB(0, 255, 0)
-    setText(f"M{mode} Set {set_num}/{total_sets} {status_text}\n{bar} {remaining_s}s")
+    setText(f"{line1}\n{bar} {remaining_s}s")
 
 
 def run_rest_interval(set_num, total_sets, rest_s):
     """세트 사이 휴식 구간"""
     for t in range(rest_s):
+        tick_start = time.perf_counter()
         remaining_s = rest_s - t
         bar = get_progress_bar(t, rest_s, 10)
 
         setRGB(0, 150, 255)
         setText(f"Rest {set_num}/{total_sets}\n{bar} {remaining_s}s")
+        publish_state(phase="REST", set=set_num, remaining_s=remaining_s, motion=None, zones=None)
         
         # Blink D5 for Rest
         if t % 2 == 0:
@@ -294,6 +746,7 @@ def run_rest_interval(set_num, total_sets, rest_s):
             all_leds_off()
             time.sleep(1.5)
             return False
+        record_tick(time.perf_counter() - tick_start)
             
     set_led_state(LED_PINS[1], 0) # Ensure off
     start_sound()  # 휴식 끝 → 다음 세트 시작 알림
@@ -310,7 +763,9 @@ def run_single_set(set_num, total_sets, mode, exercise_s, rest_s):
     required_state = 1 if mode == 1 else 0
 
     while timer_s < exercise_s:
-        motion = read_pir_stable()
+        tick_start = time.perf_counter()
+        zones = read_pir_zones()
+        motion = fuse_motion(zones)
 
         # 상태 변화 감지 비프음
         if last_pir_state != -1 and motion != last_pir_state:
@@ -324,12 +779,16 @@ def run_single_set(set_num, total_sets, mode, exercise_s, rest_s):
                 return False
             last_valid_state_time = time.time()
             last_pir_state = -1
+            tick_start = time.perf_counter() # Pause 대기 시간은 틱 지연에서 제외
 
         # 정상 상태면 타이머 갱신
         if motion == required_state:
             last_valid_state_time = time.time()
 
-        update_exercise_display(mode, set_num, total_sets, motion, timer_s, exercise_s)
+        update_exercise_display(mode, set_num, total_sets, motion, timer_s, exercise_s, zones)
+        publish_state(phase="EXERCISE", set=set_num, total_sets=total_sets,
+                      remaining_s=exercise_s - timer_s, motion=motion,
+                      zones=format_zones(zones))
         
         # Blink D4 for Exercise
         if timer_s % 2 == 0:
@@ -341,6 +800,7 @@ def run_single_set(set_num, total_sets, mode, exercise_s, rest_s):
             stop_bgm()
             all_leds_off()
             return False
+        record_tick(time.perf_counter() - tick_start, PIR_SAMPLES * PIR_INTERVAL_S) # PIR 스캔만큼은 예상된 작업
 
         timer_s += 1
     
@@ -366,8 +826,14 @@ def run_exercise_session(m):
     rest_s = m[2][0]
     total_sets = m[3][0]
 
+    publish_state(phase="START", mode=mode, set=0, total_sets=total_sets, reason=None)
+
     start_sound()
-    if responsive_sleep(0.5):
+    # 시작 알림 후 0.5s 대기 시간 안에서 온습도 갱신 (대시보드용, 틱 중에는 dht 호출 안 함)
+    wait_start = time.time()
+    if DASHBOARD_ENABLED:
+        read_env()
+    if responsive_sleep(max(0.0, 0.5 - (time.time() - wait_start))):
         return
 
     for set_num in range(1, total_sets + 1):
@@ -378,6 +844,7 @@ def run_exercise_session(m):
     # 완료 화면
     setRGB(255, 0, 255)
     setText("Complete!\nPress any btn")
+    publish_state(phase="COMPLETE", remaining_s=0, motion=None, zones=None)
     
     # Completion Blink
     for _ in range(3):
@@ -401,6 +868,7 @@ def start_exercise(m):
     all_leds_off() # Ensure all off
 
     print("=== 운동 종료 ===")
+    publish_state(phase="MENU", set=None, remaining_s=None, motion=None, zones=None, reason=None)
 
     #운동기록
     try:
@@ -422,16 +890,31 @@ def start_exercise(m):
     return 0  # 운동 후 다시 메뉴로 돌아감 (step = 0)
 
 #온습도
+def read_env():
+    """DHT 읽고 대시보드에 게시"""
+    try:
+        temp, hum = dht(sensor_port, sensor_type)
+    except Exception as e:
+        print(f"DHT read error: {e}")
+        return None, None
+    if not (math.isnan(temp) or math.isnan(hum)):
+        publish_state(temp=round(temp, 1), hum=round(hum, 1))
+    return temp, hum
+
 def show_temp():
-    temp, hum = dht(sensor_port, sensor_type)
+    temp, hum = read_env()
 
-    if 15 <= temp <= 27 and 30 <= hum <= 70:
-        status = "GOOD"
+    if temp is None or math.isnan(temp) or math.isnan(hum):
+        setRGB(255, 100, 100)
+        setText("Sensor Error\n(Press < to exit)")
     else:
-        status = "BAD"
+        if 15 <= temp <= 27 and 30 <= hum <= 70:
+            status = "GOOD"
+        else:
+            status = "BAD"
 
-    setRGB(100, 255, 100)
-    setText(f"{temp:.1f}°C {hum:.1f}%\nStatus: {status}")
+        setRGB(100, 255, 100)
+        setText(f"{temp:.1f}°C {hum:.1f}%\nStatus: {status}")
 
     while True:
         if GPIO.input(btn[3]) == GPIO.HIGH:
@@ -604,6 +1087,104 @@ def show_level():
     return 0
 
 
+def show_diagnostics():
+    """숨김 진단 화면 (모드 화면에서 B1+B3 동시에): 틱 통계 + 호출별 지연"""
+    setRGB(255, 255, 255)
+    if not PROFILE_ENABLED:
+        setText("Profiler OFF\n(Press < to exit)")
+        while GPIO.input(btn[3]) == GPIO.LOW:
+            time.sleep(0.05)
+        ok_sound()
+        time.sleep(BUTTON_DEBOUNCE_S)
+        return 0
+
+    names = sorted(_profile)
+    page = 0
+    total = len(names) + 1 # 0페이지는 틱 통계
+
+    def fmt_ms(ms):
+        """16칸에 맞추기: 1ms 이상은 정수, 미만은 '.02' 형태"""
+        return f"{ms:.0f}" if ms >= 1 else f"{ms:.2f}".lstrip("0")
+
+    def fmt_count(n):
+        """최대 6칸: 12345 / 12345k / 123M"""
+        if n < 100000:
+            return str(n)
+        if n < 100000000:
+            return f"{n // 1000}k"
+        return f"{n // 1000000}M"
+
+    def show_page():
+        if page == 0:
+            line1 = f"Tick{fmt_count(_tick_stats['ticks'])} L{fmt_count(_tick_stats['late'])}"
+            line2 = f"Miss{fmt_count(_tick_stats['missed'])} +{_tick_stats['overrun_s']:.0f}s"
+            setText(f"{line1[:16]}\n{line2[:16]}")
+            return
+        name = names[page - 1]
+        count, total_s, max_s, _ = _profile[name]
+        p50 = percentile_ms(name, 0.5)
+        p99 = percentile_ms(name, 0.99)
+        if name == "tick":
+            # 틱은 평균/최대가 더 직관적
+            line2 = f"av{fmt_ms(total_s / count * 1000)} mx{fmt_ms(max_s * 1000)}"
+        else:
+            line2 = f"50:{fmt_ms(p50)} 99:{fmt_ms(p99)}"
+        setText(f"{name[:9]} {fmt_count(count)}\n{line2[:16]}")
+        print(f"[DIAG] {name}: n={count} p50<{p50:g}ms p99<{p99:g}ms max={max_s * 1000:.2f}ms")
+
+    show_page()
+
+    while True:
+        # --- Next (B1) ---
+        if GPIO.input(btn[0]) == GPIO.HIGH:
+            if page < total - 1:
+                page += 1
+                ok_sound()
+                show_page()
+            else:
+                cancel_sound()
+            time.sleep(BUTTON_DEBOUNCE_S)
+
+        # --- Prev (B3) ---
+        elif GPIO.input(btn[2]) == GPIO.HIGH:
+            if page > 0:
+                page -= 1
+                ok_sound()
+                show_page()
+            else:
+                cancel_sound()
+            time.sleep(BUTTON_DEBOUNCE_S)
+
+        # --- Exit (B4) ---
+        elif GPIO.input(btn[3]) == GPIO.HIGH:
+            ok_sound()
+            time.sleep(BUTTON_DEBOUNCE_S)
+            break
+
+        time.sleep(0.05)
+
+    return 0
+
+
+def open_diagnostics_on_chord():
+    """모드 화면에서 B1/B3 중 하나가 눌리면 값 변경 전에 나머지 버튼을 잠깐 기다림.
+    어느 쪽이 먼저 눌려도 B1+B3 이면 진단 화면을 열고 True 반환"""
+    chord_deadline = time.time() + DIAG_CHORD_WINDOW_S
+    while GPIO.input(btn[0]) == GPIO.LOW or GPIO.input(btn[2]) == GPIO.LOW:
+        if time.time() >= chord_deadline:
+            return False
+        time.sleep(0.01)
+
+    ok_sound()
+    while GPIO.input(btn[0]) == GPIO.HIGH or GPIO.input(btn[2]) == GPIO.HIGH:
+        time.sleep(0.05) # 두 버튼을 뗄 때까지 대기
+    show_diagnostics()
+    menu_funcs[step](menu)
+    time.sleep(BUTTON_DEBOUNCE_S)
+    note_activity()
+    return True
+
+
 # ========================================
 # Main Loop 
 # ========================================
@@ -613,13 +1194,18 @@ step = 0
 setRGB(0,255,0)
 print("mode start! (Ctrl+C로 종료)")
 init_hardware()
+init_wake_sources()
+start_dashboard()
 menu_funcs[step](menu)
 
 try:
     while True:
         # --- Button 1 (Val+) ---
         if GPIO.input(btn[0]) == GPIO.HIGH:
+            if step == 0 and open_diagnostics_on_chord():
+                continue
             ok_sound() # Beep on button press
+
             match step:
                 case 0: # Mode
                     menu[0][0] += 1
@@ -634,6 +1220,7 @@ try:
             
             menu_funcs[step](menu)
             time.sleep(BUTTON_DEBOUNCE_S)
+            note_activity()
         
         # --- Button 2 (Next) ---
         elif GPIO.input(btn[1]) == GPIO.HIGH:
@@ -654,9 +1241,12 @@ try:
 
             menu_funcs[step](menu)
             time.sleep(BUTTON_DEBOUNCE_S)
+            note_activity()
 
         # --- Button 3 (Val-) ---
         elif GPIO.input(btn[2]) == GPIO.HIGH:
+            if step == 0 and open_diagnostics_on_chord():
+                continue
             ok_sound() # Beep on button press
             match step:
                 case 0: # Mode
@@ -672,6 +1262,7 @@ try:
             
             menu_funcs[step](menu)
             time.sleep(BUTTON_DEBOUNCE_S)
+            note_activity()
 
         # --- Button 4 (Prev / HOLD TO QUIT) ---
         elif GPIO.input(btn[3]) == GPIO.HIGH:
@@ -696,13 +1287,25 @@ try:
                 menu_funcs[step](menu)
                 
             time.sleep(BUTTON_DEBOUNCE_S)
+            note_activity()
             
         else:
+            # --- NEW: Idle power mode ---
+            if _wake_event.is_set(): # IR 등 버튼 외 입력도 활동으로 간주
+                _wake_event.clear()
+                note_activity()
+            poll_menu_pir() # 모션이 있으면 활동으로 간주
+            if time.time() - _last_activity >= IDLE_DIM_S:
+                run_idle()
+                continue
+            # --- END NEW ---
             time.sleep(0.01)
 
 except KeyboardInterrupt:
     print("\n종료합니다.")
 finally:
+    stop_dashboard()
+    dump_profile()
     GPIO.cleanup()
     setRGB(128, 128, 128)
     setText("Goodbye!")
\ No newline at end of file